@@ -1,4 +1,17 @@
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize([
+        Extension(
+            'coolseq.align._pairwise',
+            ['src/coolseq/align/_pairwise.pyx'],
+            extra_compile_args=['-O3'],
+        ),
+    ])
+except ImportError:
+    # Cython is optional; the pure-Python/numba paths cover everything.
+    ext_modules = []
 
 entry_points = """\
 [console_scripts]
@@ -15,10 +28,12 @@ setup(
     package_dir={'': 'src'},
 #    entry_points=entry_points,
     include_package_data=True,
+    ext_modules=ext_modules,
     package_data={
         'coolseq': ['align/samples.fasta'],
     },
     install_requires=[
         'PyYAML',
+        'numpy>=2.0',
     ],
 )
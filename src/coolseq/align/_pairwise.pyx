@@ -0,0 +1,41 @@
+# cython: boundscheck=False, wraparound=False
+"""Compiled Needleman-Wunsch fill loop.
+
+This is an ahead-of-time compiled alternative to the numba kernel in
+pairwise.py, for deployments where JIT warmup or the numba dependency
+is unwanted. It must stay in lockstep with _fill_nw there, including
+the left/top/diagonal tie-break order.
+
+"""
+
+
+cpdef void fill_nw(const unsigned char[::1] seq1,
+                   const unsigned char[::1] seq2,
+                   int match, int mismatch, int gap_extend,
+                   int[:, ::1] scores,
+                   signed char[:, ::1] arrows) noexcept nogil:
+    """Fill the body of the NW score and arrow matrices."""
+    cdef Py_ssize_t n = seq1.shape[0]
+    cdef Py_ssize_t m = seq2.shape[0]
+    cdef Py_ssize_t i, j
+    cdef int top_left, top, left
+    for i in range(1, n + 1):
+        scores[i, 0] = scores[i-1, 0] + gap_extend
+        arrows[i, 0] = 2  # T_ARROW
+        for j in range(1, m + 1):
+            if seq1[i-1] == seq2[j-1]:
+                top_left = scores[i-1, j-1] + match
+            else:
+                top_left = scores[i-1, j-1] + mismatch
+            top = scores[i-1, j] + gap_extend
+            left = scores[i, j-1] + gap_extend
+            # Ties break in favor of left, then top, then diagonal.
+            if left >= top and left >= top_left:
+                scores[i, j] = left
+                arrows[i, j] = 3  # L_ARROW
+            elif top >= top_left:
+                scores[i, j] = top
+                arrows[i, j] = 2  # T_ARROW
+            else:
+                scores[i, j] = top_left
+                arrows[i, j] = 1  # D_ARROW
@@ -9,17 +9,45 @@ number of support functions are also found here.
 """
 from abc import ABC, abstractmethod
 from collections.abc import Iterable, Sequence
-from itertools import islice
-from typing import Optional
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+try:
+    from numba import njit
+    from numba import prange as _numba_prange
+    _NUMBA_AVAILABLE = True
+    # numba ships no usable stub for prange; treating it as Any keeps
+    # the parallel loops clean under strict mypy.
+    prange: Any = _numba_prange
+except ImportError:  # pragma: no cover
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+try:
+    from coolseq.align._pairwise import fill_nw as _fill_nw_compiled  # type: ignore[import-untyped]
+    _COMPILED_AVAILABLE = True
+except ImportError:
+    _COMPILED_AVAILABLE = False
+
+try:
+    import parasail  # type: ignore[import-untyped]
+    _PARASAIL_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _PARASAIL_AVAILABLE = False
 
 
 # Type definitions
 Score = int
 Arrow = int
-Matrix = list[list[int]]
-ScoreMatrix = list[list[Score]]
-ArrowMatrix = list[list[Arrow]]
+Matrix = npt.NDArray[Any]
+ScoreMatrix = npt.NDArray[np.signedinteger[Any]]
+ArrowMatrix = npt.NDArray[np.int8]
 ScoringOptions = dict[str, int]
+# Sequences are accepted as text but compared as bytes in the hot
+# loops, since indexing bytes yields plain ints.
+SeqData = str | bytes
 
 
 # Arrow value constants
@@ -28,6 +56,10 @@ D_ARROW = 1  # Diagonal
 T_ARROW = 2  # Top
 L_ARROW = 3  # Left
 
+# Sentinel for cells outside a banded fill, low enough that the max
+# never picks an unfilled neighbor but safe from int32 overflow.
+NEG_SENTINEL = -(2**30)
+
 ARROW_CHAR_MAP = {
     S_ARROW: '∅',
     D_ARROW: '↖',
@@ -35,6 +67,431 @@ ARROW_CHAR_MAP = {
     L_ARROW: '←',
 }
 
+# Traceback step (di, dj) for each arrow value, so following an arrow
+# is a table lookup instead of a branch cascade.
+ARROW_STEPS = (
+    (0, 0),  # S_ARROW
+    (1, 1),  # D_ARROW
+    (1, 0),  # T_ARROW
+    (0, 1),  # L_ARROW
+)
+
+
+def _seq_to_int(sequence: str) -> npt.NDArray[np.uint8]:
+    """Encode a sequence as an array of character codes.
+
+    Accepts anything string-like, including Biopython Seq objects.
+
+    """
+    return np.frombuffer(str(sequence).encode('ascii'), dtype=np.uint8)
+
+
+def _fill_nw(
+        seq1: npt.NDArray[np.uint8], seq2: npt.NDArray[np.uint8],
+        match: int, mismatch: int, gap_extend: int,
+        scores: ScoreMatrix, arrows: ArrowMatrix,
+    ) -> None:
+    """Fill the body of the NW score and arrow matrices.
+
+    This is the hot loop of the alignment. It works purely on scalars
+    and preallocated arrays so that numba can compile it to native
+    code when available.
+
+    """
+    n = seq1.shape[0]
+    m = seq2.shape[0]
+    for i in range(1, n + 1):
+        scores[i, 0] = scores[i-1, 0] + gap_extend
+        arrows[i, 0] = T_ARROW
+        for j in range(1, m + 1):
+            if seq1[i-1] == seq2[j-1]:
+                top_left = scores[i-1, j-1] + match
+            else:
+                top_left = scores[i-1, j-1] + mismatch
+            top = scores[i-1, j] + gap_extend
+            left = scores[i, j-1] + gap_extend
+            # Ties break in favor of left, then top, then diagonal.
+            if left >= top and left >= top_left:
+                scores[i, j] = left
+                arrows[i, j] = L_ARROW
+            elif top >= top_left:
+                scores[i, j] = top
+                arrows[i, j] = T_ARROW
+            else:
+                scores[i, j] = top_left
+                arrows[i, j] = D_ARROW
+
+
+if _NUMBA_AVAILABLE:
+    _fill_nw = njit(cache=True)(_fill_nw)
+
+
+def _fill_nw_default(
+        seq1: npt.NDArray[np.uint8], seq2: npt.NDArray[np.uint8],
+        scores: ScoreMatrix, arrows: ArrowMatrix,
+    ) -> None:
+    """Fill the NW matrices for the default 1/-1/-1 scoring.
+
+    Specialized twin of _fill_nw with the match, mismatch, and gap
+    constants folded in, which covers the vast majority of calls and
+    lets the compiler collapse the match test into branchless
+    arithmetic.
+
+    """
+    n = seq1.shape[0]
+    m = seq2.shape[0]
+    for i in range(1, n + 1):
+        scores[i, 0] = scores[i-1, 0] - 1
+        arrows[i, 0] = T_ARROW
+        for j in range(1, m + 1):
+            top_left = scores[i-1, j-1] + 1 - 2 * (seq1[i-1] != seq2[j-1])
+            top = scores[i-1, j] - 1
+            left = scores[i, j-1] - 1
+            # Ties break in favor of left, then top, then diagonal.
+            if left >= top and left >= top_left:
+                scores[i, j] = left
+                arrows[i, j] = L_ARROW
+            elif top >= top_left:
+                scores[i, j] = top
+                arrows[i, j] = T_ARROW
+            else:
+                scores[i, j] = top_left
+                arrows[i, j] = D_ARROW
+
+
+if _NUMBA_AVAILABLE:
+    _fill_nw_default = njit(cache=True)(_fill_nw_default)
+
+
+def _fill_nw_submat(
+        codes1: npt.NDArray[np.uint8], codes2: npt.NDArray[np.uint8],
+        submatrix: npt.NDArray[np.int32], gap_extend: int,
+        scores: ScoreMatrix, arrows: ArrowMatrix,
+    ) -> None:
+    """Fill the body of the NW matrices from a substitution matrix.
+
+    Sequences arrive as base codes, so each cell's substitution
+    score is a plain table load from the row for the current base
+    instead of a match/mismatch branch.
+
+    """
+    n = codes1.shape[0]
+    m = codes2.shape[0]
+    for i in range(1, n + 1):
+        scores[i, 0] = scores[i-1, 0] + gap_extend
+        arrows[i, 0] = T_ARROW
+        sub_row = submatrix[codes1[i-1]]
+        for j in range(1, m + 1):
+            top_left = scores[i-1, j-1] + sub_row[codes2[j-1]]
+            top = scores[i-1, j] + gap_extend
+            left = scores[i, j-1] + gap_extend
+            # Ties break in favor of left, then top, then diagonal.
+            if left >= top and left >= top_left:
+                scores[i, j] = left
+                arrows[i, j] = L_ARROW
+            elif top >= top_left:
+                scores[i, j] = top
+                arrows[i, j] = T_ARROW
+            else:
+                scores[i, j] = top_left
+                arrows[i, j] = D_ARROW
+
+
+if _NUMBA_AVAILABLE:
+    _fill_nw_submat = njit(cache=True)(_fill_nw_submat)
+
+
+def _fill_nw_diag(
+        seq1: npt.NDArray[np.uint8], seq2: npt.NDArray[np.uint8],
+        match: int, mismatch: int, gap_extend: int,
+        scores: ScoreMatrix, arrows: ArrowMatrix,
+    ) -> None:
+    """Fill the body of the NW matrices one anti-diagonal at a time.
+
+    Cells on the anti-diagonal i + j = p only depend on the two
+    previous diagonals, so each diagonal can be computed with whole
+    array operations instead of a Python loop per cell. This is the
+    fallback fill when numba is not available.
+
+    """
+    n = seq1.shape[0]
+    m = seq2.shape[0]
+    # The left edge is the cumulative gap penalty, always arrived at
+    # from above.
+    scores[1:, 0] = gap_extend * np.arange(1, n + 1, dtype=np.int32)
+    arrows[1:, 0] = T_ARROW
+    # One index vector serves every diagonal; each diagonal slices it
+    # rather than allocating a fresh arange.
+    row_indices = np.arange(1, n + 1)
+    for p in range(2, n + m + 1):
+        i_min = max(1, p - m)
+        i_max = min(n, p - 1)
+        if i_min > i_max:
+            continue
+        i_idx = row_indices[i_min-1:i_max]
+        j_idx = p - i_idx
+        match_vec = np.where(
+            seq1[i_idx - 1] == seq2[j_idx - 1], match, mismatch)
+        top_left = scores[i_idx - 1, j_idx - 1] + match_vec
+        top = scores[i_idx - 1, j_idx] + gap_extend
+        left = scores[i_idx, j_idx - 1] + gap_extend
+        scores[i_idx, j_idx] = np.maximum(
+            np.maximum(top, left), top_left)
+        # Ties break in favor of left, then top, then diagonal, to
+        # match the scalar kernel.
+        arrows[i_idx, j_idx] = np.where(
+            left >= np.maximum(top, top_left), L_ARROW,
+            np.where(top >= top_left, T_ARROW, D_ARROW))
+
+
+def _fill_nw_batch(
+        seqs1: npt.NDArray[np.uint8], lengths1: npt.NDArray[np.int64],
+        seqs2: npt.NDArray[np.uint8], lengths2: npt.NDArray[np.int64],
+        match: int, mismatch: int, gap_extend: int,
+        scores: npt.NDArray[np.int32], arrows: npt.NDArray[np.int8],
+    ) -> None:
+    """Fill score and arrow matrices for a whole batch of pairs.
+
+    Sequences are padded to a common length; lengths1 and lengths2
+    carry the real length of each pair. Driving the batch from inside
+    one compiled function avoids re-entering the interpreter per
+    pair, and the pairs are independent, so numba spreads them across
+    cores via prange.
+
+    """
+    for b in prange(seqs1.shape[0]):  # pylint: disable=not-an-iterable
+        n = lengths1[b]
+        m = lengths2[b]
+        for j in range(1, m + 1):
+            scores[b, 0, j] = scores[b, 0, j-1] + gap_extend
+            arrows[b, 0, j] = L_ARROW
+        _fill_nw(
+            seqs1[b, :n], seqs2[b, :m], match, mismatch, gap_extend,
+            scores[b, :n+1, :m+1], arrows[b, :n+1, :m+1])
+
+
+if _NUMBA_AVAILABLE:
+    _fill_nw_batch = njit(cache=True, parallel=True)(_fill_nw_batch)
+
+
+def _fill_nw_batch_vec(
+        seqs1: npt.NDArray[np.uint8], seqs2: npt.NDArray[np.uint8],
+        match: int, mismatch: int, gap_extend: int,
+        scores: npt.NDArray[np.int32], arrows: npt.NDArray[np.int8],
+    ) -> None:
+    """Fill a padded batch of NW matrices, vectorized across pairs.
+
+    Rognes-style inter-sequence vectorization: at each cell (i, j)
+    the batch axis supplies a full-width vector no matter how short
+    the sequences (and hence anti-diagonals) are. Cells beyond a
+    pair's real lengths compute garbage, but garbage is only ever
+    read by other out-of-range cells, so the valid regions that the
+    traceback slices out are exact. Top edges must be filled per pair
+    before calling; the left column is filled here.
+
+    """
+    n = seqs1.shape[1]
+    m = seqs2.shape[1]
+    for i in range(1, n + 1):
+        scores[:, i, 0] = scores[:, i-1, 0] + gap_extend
+        arrows[:, i, 0] = T_ARROW
+        # One comparison row per pair, reused across the inner loop.
+        match_row = np.where(
+            seqs1[:, i-1, np.newaxis] == seqs2, match, mismatch)
+        for j in range(1, m + 1):
+            top_left = scores[:, i-1, j-1] + match_row[:, j-1]
+            top = scores[:, i-1, j] + gap_extend
+            left = scores[:, i, j-1] + gap_extend
+            best = np.maximum(top_left, np.maximum(top, left))
+            scores[:, i, j] = best
+            # Ties break in favor of left, then top, then diagonal.
+            arrows[:, i, j] = np.where(
+                left == best, L_ARROW,
+                np.where(top == best, T_ARROW, D_ARROW))
+
+
+def _nw_last_row(
+        seq1: npt.NDArray[np.uint8], seq2: npt.NDArray[np.uint8],
+        match: int, mismatch: int, gap_extend: int,
+    ) -> npt.NDArray[np.int32]:
+    """Return the last row of the NW score matrix in O(m) memory.
+
+    Keeps only two rolling rows, which is all the Hirschberg split
+    search needs.
+
+    """
+    n = seq1.shape[0]
+    m = seq2.shape[0]
+    prev = np.empty(m + 1, dtype=np.int32)
+    curr = np.empty(m + 1, dtype=np.int32)
+    for j in range(m + 1):
+        prev[j] = j * gap_extend
+    for i in range(1, n + 1):
+        curr[0] = prev[0] + gap_extend
+        for j in range(1, m + 1):
+            if seq1[i-1] == seq2[j-1]:
+                top_left = prev[j-1] + match
+            else:
+                top_left = prev[j-1] + mismatch
+            top = prev[j] + gap_extend
+            left = curr[j-1] + gap_extend
+            best = top_left
+            if top > best:
+                best = top
+            if left > best:
+                best = left
+            curr[j] = best
+        prev, curr = curr, prev
+    return prev
+
+
+if _NUMBA_AVAILABLE:
+    _nw_last_row = njit(cache=True)(_nw_last_row)
+
+
+def _fill_nw_banded(
+        seq1: npt.NDArray[np.uint8], seq2: npt.NDArray[np.uint8],
+        match: int, mismatch: int, gap_extend: int, band: int,
+        scores: ScoreMatrix, arrows: ArrowMatrix,
+    ) -> None:
+    """Fill only a diagonal band of the NW matrices.
+
+    Cells outside the band keep the large negative sentinel they were
+    initialized with, so the max never selects them. For similar
+    sequences the optimal path stays near the main diagonal and the
+    fill drops from O(n*m) to O(n*band) cells.
+
+    """
+    n = seq1.shape[0]
+    m = seq2.shape[0]
+    scores[0, 0] = 0
+    arrows[0, 0] = S_ARROW
+    for j in range(1, min(m, band) + 1):
+        scores[0, j] = scores[0, j-1] + gap_extend
+        arrows[0, j] = L_ARROW
+    for i in range(1, n + 1):
+        # The band is centered on the rescaled main diagonal.
+        center = i * m // n
+        j_lo = max(0, center - band)
+        j_hi = min(m, center + band)
+        for j in range(j_lo, j_hi + 1):
+            if j == 0:
+                scores[i, 0] = scores[i-1, 0] + gap_extend
+                arrows[i, 0] = T_ARROW
+                continue
+            if seq1[i-1] == seq2[j-1]:
+                top_left = scores[i-1, j-1] + match
+            else:
+                top_left = scores[i-1, j-1] + mismatch
+            top = scores[i-1, j] + gap_extend
+            left = scores[i, j-1] + gap_extend
+            # Ties break in favor of left, then top, then diagonal.
+            if left >= top and left >= top_left:
+                scores[i, j] = left
+                arrows[i, j] = L_ARROW
+            elif top >= top_left:
+                scores[i, j] = top
+                arrows[i, j] = T_ARROW
+            else:
+                scores[i, j] = top_left
+                arrows[i, j] = D_ARROW
+
+
+if _NUMBA_AVAILABLE:
+    _fill_nw_banded = njit(cache=True)(_fill_nw_banded)
+
+
+def _fill_wsb(
+        seq1: npt.NDArray[np.uint8], seq2: npt.NDArray[np.uint8],
+        match: int, mismatch: int, gap_start: int, gap_extend: int,
+        scores: ScoreMatrix, arrows: ArrowMatrix,
+    ) -> None:
+    """Fill the body of the WSB score and arrow matrices.
+
+    Uses the Gotoh trick: the best affine gap ending at a cell is a
+    running minimum of the gap one step shorter extended and a fresh
+    gap opened from the neighbor, so the O(i) and O(j) gap searches
+    per cell collapse to O(1) updates. The candidate values are
+    identical to the exhaustive search for any gap penalties, so
+    scores and arrows (including tie-breaks) are unchanged.
+
+    """
+    n = seq1.shape[0]
+    m = seq2.shape[0]
+    # top_gap[j] is the best score of a gap ending just above row i
+    # extended down to it, per column.
+    top_gap = np.empty(m + 1, dtype=np.int64)
+    for j in range(m + 1):
+        top_gap[j] = scores[0, j] + gap_start + gap_extend
+    for i in range(1, n + 1):
+        # The left-most score is the best gap score above.
+        scores[i, 0] = top_gap[0]
+        arrows[i, 0] = T_ARROW
+        top_gap[0] = min(
+            top_gap[0] + gap_extend, scores[i, 0] + gap_start + gap_extend)
+        # Best left-gap score, swept along the row.
+        left_gap = scores[i, 0] + gap_start + gap_extend
+        for j in range(1, m + 1):
+            if seq1[i-1] == seq2[j-1]:
+                top_left = scores[i-1, j-1] + match
+            else:
+                top_left = scores[i-1, j-1] + mismatch
+            top = top_gap[j]
+            left = left_gap
+            # Ties break in favor of left, then top, then diagonal.
+            if left <= top and left <= top_left:
+                scores[i, j] = left
+                arrows[i, j] = L_ARROW
+            elif top <= top_left:
+                scores[i, j] = top
+                arrows[i, j] = T_ARROW
+            else:
+                scores[i, j] = top_left
+                arrows[i, j] = D_ARROW
+            top_gap[j] = min(
+                top_gap[j] + gap_extend, scores[i, j] + gap_start + gap_extend)
+            left_gap = min(
+                left_gap + gap_extend, scores[i, j] + gap_start + gap_extend)
+
+
+if _NUMBA_AVAILABLE:
+    _fill_wsb = njit(cache=True)(_fill_wsb)
+
+
+def _fill_wsb_batch(
+        seqs1: npt.NDArray[np.uint8], lengths1: npt.NDArray[np.int64],
+        seqs2: npt.NDArray[np.uint8], lengths2: npt.NDArray[np.int64],
+        match: int, mismatch: int, gap_start: int, gap_extend: int,
+        scores: npt.NDArray[np.int32], arrows: npt.NDArray[np.int8],
+    ) -> None:
+    """Fill WSB score and arrow matrices for a whole batch of pairs.
+
+    The WSB twin of _fill_nw_batch: pairs are padded to a common
+    shape and independent, so numba spreads them across cores via
+    prange. Top edges use the same Gotoh running-minimum gap as the
+    body, which is exact for any gap penalties.
+
+    """
+    for b in prange(seqs1.shape[0]):  # pylint: disable=not-an-iterable
+        n = lengths1[b]
+        m = lengths2[b]
+        scores[b, 0, 0] = 0
+        arrows[b, 0, 0] = S_ARROW
+        left_gap = gap_start + gap_extend
+        for j in range(1, m + 1):
+            scores[b, 0, j] = left_gap
+            arrows[b, 0, j] = L_ARROW
+            left_gap = min(
+                left_gap + gap_extend, scores[b, 0, j] + gap_start + gap_extend)
+        _fill_wsb(
+            seqs1[b, :n], seqs2[b, :m], match, mismatch,
+            gap_start, gap_extend,
+            scores[b, :n+1, :m+1], arrows[b, :n+1, :m+1])
+
+
+if _NUMBA_AVAILABLE:
+    _fill_wsb_batch = njit(cache=True, parallel=True)(_fill_wsb_batch)
+
 
 class Scorer(ABC):
     """Abstract scorer"""
@@ -44,16 +501,42 @@ class Scorer(ABC):
     gap_extend = -1
 
     @abstractmethod
-    def get_top_edges(self, width: int) -> tuple[ScoreMatrix, ArrowMatrix]:
+    def fill_top_edges(self, scores: ScoreMatrix, arrows: ArrowMatrix) -> None:
         """Fill the top edge of the score and arrow matrices."""
 
     @abstractmethod
     def fill_next_row(
-            self, scores: ScoreMatrix, arrows: ArrowMatrix, i: int, width: int, sequence1: str, sequence2: str
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, i: int, width: int, sequence1: SeqData, sequence2: SeqData
         ) -> None:
         """Generate the next row of scores and arrows."""
 
-    def match_score(self, i: int, j: int, seq1: str, seq2: str) -> int:
+    def fill_body(
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, sequence1: str, sequence2: str
+        ) -> None:
+        """Fill everything below the top edge, row by row."""
+        # Encode once so the per-cell comparisons are plain int
+        # compares rather than one-character string allocations.
+        seq1 = str(sequence1).encode('ascii')
+        seq2 = str(sequence2).encode('ascii')
+        n = len(seq1)
+        width = len(seq2) + 1
+        for i in range(n):
+            self.fill_next_row(scores, arrows, i + 1, width, seq1, seq2)
+
+    def fill_banded(
+            self, scores: ScoreMatrix, arrows: ArrowMatrix,
+            sequence1: str, sequence2: str, band: int,
+        ) -> None:
+        """Fill the matrices inside a diagonal band."""
+        raise NotImplementedError
+
+    def score_bound(self, n: int, m: int) -> int:
+        """Upper bound on the magnitude of any score in the matrix."""
+        per_step = max(
+            abs(self.match), abs(self.mismatch), abs(self.gap_extend))
+        return per_step * (n + m)
+
+    def match_score(self, i: int, j: int, seq1: SeqData, seq2: SeqData) -> int:
         """Return the match score for a position."""
         if is_match(i, j, seq1, seq2):
             score = self.match
@@ -73,78 +556,186 @@ class NWScorer(Scorer):
         self.mismatch = mismatch
         self.gap_extend = gap_extend
 
-    def get_top_edges(self, width: int) -> tuple[ScoreMatrix, ArrowMatrix]:
+    def fill_top_edges(self, scores: ScoreMatrix, arrows: ArrowMatrix) -> None:
         """Fill the top edge of the score and arrow matrices.
 
-        >>> scorer = NWScorer(1, -1, -1)
-        >>> scores, arrows = scorer.get_top_edges(5)
+        >>> scores = np.zeros((1, 5), dtype=np.int32)
+        >>> arrows = np.zeros((1, 5), dtype=np.int8)
+        >>> NWScorer(1, -1, -1).fill_top_edges(scores, arrows)
         >>> scores
-        [[0, -1, -2, -3, -4]]
+        array([[ 0, -1, -2, -3, -4]], dtype=int32)
         >>> arrows
-        [[0, 3, 3, 3, 3]]
-        >>> scorer = NWScorer(1, -1, -2)
-        >>> scores, arrows = scorer.get_top_edges(4)
+        array([[0, 3, 3, 3, 3]], dtype=int8)
+        >>> scores = np.zeros((1, 4), dtype=np.int32)
+        >>> arrows = np.zeros((1, 4), dtype=np.int8)
+        >>> NWScorer(1, -1, -2).fill_top_edges(scores, arrows)
         >>> scores
-        [[0, -2, -4, -6]]
+        array([[ 0, -2, -4, -6]], dtype=int32)
         >>> arrows
-        [[0, 3, 3, 3]]
+        array([[0, 3, 3, 3]], dtype=int8)
 
         """
-        scores_top = []
-        arrows_top = []
+        width = scores.shape[1]
         # The top-left score is always zero and the top-left arrow is
-        # always the stop arrow.
-        score = 0
-        scores_top.append(score)
-        arrows_top.append(S_ARROW)
-        for _ in range(1, width):
-            # The next score is simply the previous score on the left
-            # plus the gap penalty, and the next arrow always points
-            # left.
-            score += self.gap_extend
-            scores_top.append(score)
-            arrows_top.append(L_ARROW)
-        return ([scores_top], [arrows_top])
+        # always the stop arrow. Each following score is simply the
+        # previous score on the left plus the gap penalty, and each
+        # following arrow always points left.
+        scores[0] = np.arange(width, dtype=np.int32) * self.gap_extend
+        arrows[0, 0] = S_ARROW
+        arrows[0, 1:] = L_ARROW
 
     def fill_next_row(
-            self, scores: ScoreMatrix, arrows: ArrowMatrix, i: int, width: int, sequence1: str, sequence2: str
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, i: int, width: int, sequence1: SeqData, sequence2: SeqData
         ) -> None:
         """Generate the next row of scores and arrows."""
+        # Hoist the row views; indexing a 1D view per cell is much
+        # cheaper than 2D indexing on the whole matrix.
+        prev_row = scores[i-1]
+        curr_row = scores[i]
+        arrow_row = arrows[i]
+        # Hoist the scoring constants too; an attribute load per term
+        # per cell adds up over the whole matrix.
+        match = self.match
+        mismatch = self.mismatch
+        gap_extend = self.gap_extend
         # The left-most score is simply the score directly above plus
-        # the gap penalty.
-        score = scores[i-1][0] + self.gap_extend
-        # The left-most arrow always points up.
-        arrow = T_ARROW
-        # Append new lists containing the initial values to the scores
-        # and arrows matrices.
-        scores.append([score])
-        arrows.append([arrow])
+        # the gap penalty, and the left-most arrow always points up.
+        curr_row[0] = prev_row[0] + gap_extend
+        arrow_row[0] = T_ARROW
+        # Precompute the substitution score against every base of
+        # sequence2 once per row, replacing a data-dependent branch
+        # per cell with a list read.
+        char1 = sequence1[i-1]
+        sub = [match if base == char1 else mismatch for base in sequence2]
         for j in range(1, width):
-            score, arrow = self.score(scores, sequence1, sequence2, i, j)
-            scores[i].append(score)
-            arrows[i].append(arrow)
+            top_left = prev_row[j-1] + sub[j-1]
+            top = prev_row[j] + gap_extend
+            left = curr_row[j-1] + gap_extend
+            # Ties break in favor of left, then top, then diagonal.
+            if left >= top and left >= top_left:
+                curr_row[j] = left
+                arrow_row[j] = L_ARROW
+            elif top >= top_left:
+                curr_row[j] = top
+                arrow_row[j] = T_ARROW
+            else:
+                curr_row[j] = top_left
+                arrow_row[j] = D_ARROW
+
+    def fill_body(
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, sequence1: str, sequence2: str
+        ) -> None:
+        """Fill everything below the top edge in one kernel call.
+
+        Prefers the ahead-of-time compiled Cython kernel, then the
+        numba-compiled one, then the vectorized NumPy fallback.
+
+        """
+        seq1 = _seq_to_int(sequence1)
+        seq2 = _seq_to_int(sequence2)
+        if _COMPILED_AVAILABLE and scores.dtype == np.int32:
+            fill = _fill_nw_compiled
+        elif _NUMBA_AVAILABLE:
+            if (self.match, self.mismatch, self.gap_extend) == (1, -1, -1):
+                _fill_nw_default(seq1, seq2, scores, arrows)
+                return
+            fill = _fill_nw
+        else:
+            fill = _fill_nw_diag
+        fill(
+            seq1, seq2,
+            self.match, self.mismatch, self.gap_extend, scores, arrows)
 
-    def score(self, scores: ScoreMatrix, sequence1: str, sequence2: str, i: int, j: int) -> tuple[Score, Arrow]:
+    def fill_banded(
+            self, scores: ScoreMatrix, arrows: ArrowMatrix,
+            sequence1: str, sequence2: str, band: int,
+        ) -> None:
+        """Fill the matrices inside a diagonal band.
+
+        The band center advances about m/n columns per row, so a band
+        narrower than that step leaves gaps between consecutive rows'
+        bands and the traceback can walk into never-written cells.
+        Widen the effective band to at least the center step plus one
+        so a corner-to-corner path always exists.
+
+        """
+        n = len(sequence1) or 1
+        m = len(sequence2) or 1
+        band = max(band, -(-m // n) + 1, -(-n // m) + 1)
+        _fill_nw_banded(
+            _seq_to_int(sequence1), _seq_to_int(sequence2),
+            self.match, self.mismatch, self.gap_extend, band,
+            scores, arrows)
+
+    def score(self, scores: ScoreMatrix, sequence1: SeqData, sequence2: SeqData, i: int, j: int) -> tuple[Score, Arrow]:
         """Calculate score and arrow values for a cell position."""
-        cell = {}
         # The diagonal score is the diagonal neighbor plus the
-        # match/mismatch score
-        top_left = scores[i-1][j-1] + self.match_score(i, j, sequence1, sequence2)
-        cell[top_left] = D_ARROW
+        # match/mismatch score, inlined to avoid two function calls
+        # per cell.
+        if sequence1[i-1] == sequence2[j-1]:
+            top_left = scores[i-1, j-1] + self.match
+        else:
+            top_left = scores[i-1, j-1] + self.mismatch
         # The top score is the top neighbor plus the gap penalty.
-        top = scores[i-1][j] + self.gap_extend
-        cell[top] = T_ARROW
+        top = scores[i-1, j] + self.gap_extend
         # The left score is the left neighbor plus the gap penalty.
-        left = scores[i][j-1] + self.gap_extend
-        cell[left] = L_ARROW
+        left = scores[i, j-1] + self.gap_extend
         # Final score is the max of the top-left, top, and left
-        # values.
-        final_score = max(top_left, top, left)
-        # The arrow points in the direction of the neighbor from where
-        # the best score came. This implementation doesn't include
-        # branches, but could with a little extra effort.
-        arrow = cell[final_score]
-        return (final_score, arrow)
+        # values. The arrow points in the direction of the neighbor
+        # from where the best score came, with ties broken in favor of
+        # left, then top, then diagonal. This implementation doesn't
+        # include branches, but could with a little extra effort.
+        if left >= top and left >= top_left:
+            return (int(left), L_ARROW)
+        if top >= top_left:
+            return (int(top), T_ARROW)
+        return (int(top_left), D_ARROW)
+
+
+class DNAScorer(NWScorer):
+    """NW scorer for DNA with a 4x4 substitution matrix.
+
+    Bases are mapped to codes 0-3 through BASE_CODES (U scores as T,
+    case-insensitively), so scoring a pair is a table load rather
+    than an equality branch, and transition/transversion-aware
+    matrices cost the same as uniform match/mismatch. With the
+    default matrix the result is identical to NWScorer over A/C/G/T
+    sequences.
+
+    >>> scorer = DNAScorer()
+    >>> scorer.submatrix
+    array([[ 1, -1, -1, -1],
+           [-1,  1, -1, -1],
+           [-1, -1,  1, -1],
+           [-1, -1, -1,  1]], dtype=int32)
+
+    """
+
+    def __init__(
+            self, submatrix: Optional[npt.NDArray[np.int32]] = None,
+            gap_extend: int = -1, match: int = 1, mismatch: int = -1,
+        ) -> None:
+        """Instantiate a scorer."""
+        super().__init__(match, mismatch, gap_extend)
+        if submatrix is None:
+            submatrix = np.full((4, 4), mismatch, dtype=np.int32)
+            np.fill_diagonal(submatrix, match)
+        self.submatrix = np.ascontiguousarray(submatrix, dtype=np.int32)
+
+    def fill_body(
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, sequence1: str, sequence2: str
+        ) -> None:
+        """Fill everything below the top edge in one kernel call."""
+        _fill_nw_submat(
+            BASE_CODES[_seq_to_int(sequence1)],
+            BASE_CODES[_seq_to_int(sequence2)],
+            self.submatrix, self.gap_extend, scores, arrows)
+
+    def score_bound(self, n: int, m: int) -> int:
+        """Upper bound on the magnitude of any score in the matrix."""
+        per_step = max(
+            int(np.abs(self.submatrix).max()), abs(self.gap_extend))
+        return per_step * (n + m)
 
 
 class WSBScorer(Scorer):
@@ -174,85 +765,118 @@ class WSBScorer(Scorer):
         }
 
 
-    def get_top_edges(self, width: int) -> tuple[ScoreMatrix, ArrowMatrix]:
+    def fill_top_edges(self, scores: ScoreMatrix, arrows: ArrowMatrix) -> None:
         """Fill the top edge of the score and arrow matrices.
 
         >>> scorer = WSBScorer()
         >>> scorer.gap_extend
         1
-        >>> scores, arrows = scorer.get_top_edges(5)
+        >>> scores = np.zeros((1, 5), dtype=np.int32)
+        >>> arrows = np.zeros((1, 5), dtype=np.int8)
+        >>> scorer.fill_top_edges(scores, arrows)
         >>> scores
-        [[0, 2, 3, 4, 5]]
+        array([[0, 2, 3, 4, 5]], dtype=int32)
         >>> arrows
-        [[0, 3, 3, 3, 3]]
-        >>> scorer = WSBScorer({'gap_extend': 2})
-        >>> scores, arrows = scorer.get_top_edges(4)
+        array([[0, 3, 3, 3, 3]], dtype=int8)
+        >>> scores = np.zeros((1, 4), dtype=np.int32)
+        >>> arrows = np.zeros((1, 4), dtype=np.int8)
+        >>> WSBScorer({'gap_extend': 2}).fill_top_edges(scores, arrows)
         >>> scores
-        [[0, 3, 5, 7]]
+        array([[0, 3, 5, 7]], dtype=int32)
         >>> arrows
-        [[0, 3, 3, 3]]
+        array([[0, 3, 3, 3]], dtype=int8)
 
         """
-        scores : ScoreMatrix = [[]]
-        arrows : ArrowMatrix = [[]]
+        width = scores.shape[1]
         # The top-left score is always zero and the top-left arrow is
         # always the stop arrow.
-        score = 0
-        scores[0].append(score)
-        arrows[0].append(S_ARROW)
-        for j in range(1, width):
-            score = self.best_gap_left(scores, 0, j)
-            scores[0].append(score)
-            arrows[0].append(L_ARROW)
-        return (scores, arrows)
+        scores[0, 0] = 0
+        arrows[0, 0] = S_ARROW
+        arrows[0, 1:] = L_ARROW
+        if self.gap_start >= 0:
+            # With a non-negative gap start, one long gap from the
+            # origin is never beaten by a split gap, so the whole row
+            # is a single broadcast expression.
+            scores[0, 1:] = self.gap_start + (
+                np.arange(1, width, dtype=np.int64) * self.gap_extend)
+        else:
+            for j in range(1, width):
+                scores[0, j] = self.best_gap_left(scores, 0, j)
 
     def fill_next_row(
-            self, scores: ScoreMatrix, arrows: ArrowMatrix, i: int, width: int, sequence1: str, sequence2: str
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, i: int, width: int, sequence1: SeqData, sequence2: SeqData
         ) -> None:
         """Generate the next row of scores and arrows."""
-        # The left-most score is simply the score directly above plus
-        # the gap penalty.
-        score = self.best_gap_top(scores, i, 0)
+        curr_row = scores[i]
+        arrow_row = arrows[i]
+        # The left-most score is simply the best gap score above.
+        curr_row[0] = self.best_gap_top(scores, i, 0)
         # The left-most arrow always points up.
-        arrow = T_ARROW
-        # Append new lists containing the initial values to the scores
-        # and arrows matrices.
-        scores.append([score])
-        arrows.append([arrow])
+        arrow_row[0] = T_ARROW
         for j in range(1, width):
             score, arrow = self.score(scores, sequence1, sequence2, i, j)
-            scores[i].append(score)
-            arrows[i].append(arrow)
+            curr_row[j] = score
+            arrow_row[j] = arrow
 
-    def score(self, scores: ScoreMatrix, sequence1: str, sequence2: str, i: int, j: int) -> tuple[Score, Arrow]:
+    def score(self, scores: ScoreMatrix, sequence1: SeqData, sequence2: SeqData, i: int, j: int) -> tuple[Score, Arrow]:
         """Calculate score and arrow values for a cell position."""
-        cell = {}
         # The diagonal score is the diagonal neighbor plus the
-        # match/mismatch score
-        top_left = scores[i-1][j-1] + self.match_score(i, j, sequence1, sequence2)
-        cell[top_left] = D_ARROW
-        # The top score is the top neighbor plus the gap penalty.
+        # match/mismatch score, inlined to avoid two function calls
+        # per cell.
+        if sequence1[i-1] == sequence2[j-1]:
+            top_left = int(scores[i-1, j-1]) + self.match
+        else:
+            top_left = int(scores[i-1, j-1]) + self.mismatch
+        # The top score is the best gap score above.
         top = self.best_gap_top(scores, i, j)
-        cell[top] = T_ARROW
-        # The left score is the left neighbor plus the gap penalty.
+        # The left score is the best gap score to the left.
         left = self.best_gap_left(scores, i, j)
-        cell[left] = L_ARROW
         # Final score is the min of the top-left, top, and left
-        # values.
-        final_score = min(top_left, top, left)
-        # The arrow points in the direction of the neighbor from where
-        # the best score came. This implementation doesn't include
-        # branches, but could with a little extra effort.
-        arrow = cell[final_score]
-        return (final_score, arrow)
+        # values. The arrow points in the direction of the neighbor
+        # from where the best score came, with ties broken in favor of
+        # left, then top, then diagonal. This implementation doesn't
+        # include branches, but could with a little extra effort.
+        if left <= top and left <= top_left:
+            return (left, L_ARROW)
+        if top <= top_left:
+            return (top, T_ARROW)
+        return (top_left, D_ARROW)
+
+    def fill_body(
+            self, scores: ScoreMatrix, arrows: ArrowMatrix, sequence1: str, sequence2: str
+        ) -> None:
+        """Fill everything below the top edge in one kernel call.
+
+        The Gotoh-style kernel is linear per cell even without numba,
+        so it is used unconditionally.
+
+        """
+        _fill_wsb(
+            _seq_to_int(sequence1), _seq_to_int(sequence2),
+            self.match, self.mismatch, self.gap_start, self.gap_extend,
+            scores, arrows)
+
+    def score_bound(self, n: int, m: int) -> int:
+        """Upper bound on the magnitude of any score in the matrix."""
+        return super().score_bound(n, m) + abs(self.gap_start)
 
     def best_gap_top(self, scores: ScoreMatrix, i: int, j: int) -> int:
         """Find the best gap score top of i, j."""
-        return min(scores[i-k][j] + self.gap_penalty(k) for k in range(1, i+1))
+        gap_start = self.gap_start
+        gap_extend = self.gap_extend
+        column = scores[:, j]
+        return min(
+            int(column[i-k]) + gap_start + k * gap_extend
+            for k in range(1, i+1))
 
     def best_gap_left(self, scores: ScoreMatrix, i: int, j: int) -> int:
         """Find the best gap score left of i, j."""
-        return min(scores[i][j-k] + self.gap_penalty(k) for k in range(1, j+1))
+        gap_start = self.gap_start
+        gap_extend = self.gap_extend
+        row = scores[i]
+        return min(
+            int(row[j-k]) + gap_start + k * gap_extend
+            for k in range(1, j+1))
 
     def gap_penalty(self, k: int) -> int:
         """Return affine gap penalty."""
@@ -260,42 +884,277 @@ class WSBScorer(Scorer):
 
 
 def nw_align(
-        sequence1: str, sequence2: str, opts: Optional[ScoringOptions] = None
+        sequence1: str, sequence2: str, opts: Optional[ScoringOptions] = None,
+        band: Optional[int] = None, verbose: bool = False,
+        backend: Optional[str] = None,
     ) -> list[str]:
-    """Return the pairwise alignment found using Needleman-Wunsch."""
+    """Return the pairwise alignment found using Needleman-Wunsch.
+
+    When band is given, only cells within that distance of the main
+    diagonal are considered, which is much faster for similar
+    sequences but may miss the optimal path if it strays outside the
+    band. When verbose is set, the score and arrow matrices are
+    printed; large alignments that take the linear-memory path never
+    materialize the matrices and so never print them. Passing
+    backend='parasail' delegates to the parasail SIMD library when it
+    is installed; ties may then resolve differently, but the
+    alignment score is the same.
+
+    """
+    opts = opts or {}
+    scorer = NWScorer(**opts)
+    if backend == 'parasail':
+        return _nw_align_parasail(str(sequence1), str(sequence2), scorer)
+    if backend is not None:
+        raise ValueError(f'unknown backend: {backend!r}')
+    if band is None and len(sequence1) * len(sequence2) > HIRSCHBERG_THRESHOLD:
+        aligned1, aligned2 = _hirschberg(str(sequence1), str(sequence2), scorer)
+        return [aligned1, aligned2]
+    scores, arrows = initialize_matrix(sequence1, sequence2, scorer, band)
+    if verbose:
+        print_matrix(scores)
+        print_arrow_matrix(arrows)
+    return _traceback_alignment(sequence1, sequence2, arrows)
+
+
+def nw_score(
+        sequence1: str, sequence2: str, opts: Optional[ScoringOptions] = None,
+    ) -> int:
+    """Return just the optimal Needleman-Wunsch alignment score.
+
+    Keeps two rolling score rows and no arrow matrix, so memory is
+    O(m) instead of O(n*m). Use this when the alignment itself is not
+    needed, such as scoring every pair while building a distance
+    matrix.
+
+    >>> nw_score('gattaca', 'gcatgcu')
+    0
+    >>> nw_score('at', 'aagt')
+    0
+
+    """
+    opts = opts or {}
+    scorer = NWScorer(**opts)
+    last_row = _nw_last_row(
+        _seq_to_int(sequence1), _seq_to_int(sequence2),
+        scorer.match, scorer.mismatch, scorer.gap_extend)
+    return int(last_row[-1])
+
+
+# Above this many matrix cells, nw_align switches to the
+# linear-memory Hirschberg strategy rather than materializing the
+# full score and arrow matrices.
+HIRSCHBERG_THRESHOLD = 4_000_000
+
+
+def _hirschberg(sequence1: str, sequence2: str, scorer: NWScorer) -> tuple[str, str]:
+    """Align two sequences in linear memory with Hirschberg's method.
+
+    Two rolling-row score sweeps locate the column where an optimal
+    path crosses the middle row, then each half is aligned
+    recursively. The score sweeps are recomputed work, at worst
+    doubling the arithmetic, in exchange for O(min(n, m)) memory
+    instead of O(n*m). The result is an optimal alignment, though
+    ties may resolve differently than the full-matrix traceback.
+
+    """
+    n = len(sequence1)
+    m = len(sequence2)
+    if n == 0:
+        return ('-' * m, sequence2)
+    if m == 0:
+        return (sequence1, '-' * n)
+    if n == 1 or m == 1:
+        # Small enough for the full-matrix path.
+        scores, arrows = initialize_matrix(sequence1, sequence2, scorer)
+        aligned1, aligned2 = _traceback_alignment(sequence1, sequence2, arrows)
+        return (aligned1, aligned2)
+    mid = n // 2
+    score_left = _nw_last_row(
+        _seq_to_int(sequence1[:mid]), _seq_to_int(sequence2),
+        scorer.match, scorer.mismatch, scorer.gap_extend)
+    score_right = _nw_last_row(
+        _seq_to_int(sequence1[mid:][::-1]), _seq_to_int(sequence2[::-1]),
+        scorer.match, scorer.mismatch, scorer.gap_extend)
+    split = int(np.argmax(score_left + score_right[::-1]))
+    top1, top2 = _hirschberg(sequence1[:mid], sequence2[:split], scorer)
+    bottom1, bottom2 = _hirschberg(sequence1[mid:], sequence2[split:], scorer)
+    return (top1 + bottom1, top2 + bottom2)
+
+
+def _nw_align_parasail(
+        sequence1: str, sequence2: str, scorer: NWScorer,
+    ) -> list[str]:
+    """Global alignment delegated to parasail's striped SIMD kernel.
+
+    Linear gaps are expressed by setting parasail's open and extend
+    penalties to the same magnitude.
+
+    >>> if _PARASAIL_AVAILABLE:
+    ...     result = _nw_align_parasail('at', 'aagt', NWScorer())
+    ...     assert result[0].replace('-', '') == 'at'
+    ...     assert result[1] == 'aagt'
+
+    """
+    if not _PARASAIL_AVAILABLE:
+        raise RuntimeError('parasail is not installed')
+    if not sequence1 or not sequence2:
+        # parasail does not accept empty sequences; the built-in path
+        # handles them trivially.
+        scores, arrows = initialize_matrix(sequence1, sequence2, scorer)
+        return _traceback_alignment(sequence1, sequence2, arrows)
+    alphabet = ''.join(sorted(set(sequence1) | set(sequence2)))
+    matrix = parasail.matrix_create(alphabet, scorer.match, scorer.mismatch)
+    gap = -scorer.gap_extend
+    result = parasail.nw_trace_striped_16(sequence1, sequence2, gap, gap, matrix)
+    return [result.traceback.query, result.traceback.ref]
+
+
+def nw_align_batch(
+        pairs: Sequence[tuple[str, str]], opts: Optional[ScoringOptions] = None,
+    ) -> list[list[str]]:
+    """Align many sequence pairs using Needleman-Wunsch.
+
+    All pairs share one padded batch of matrices and a single kernel
+    invocation, which amortizes dispatch overhead across the batch.
+
+    >>> results = nw_align_batch([('at', 'aagt'), ('gattaca', 'gcatgcu')])
+    >>> results[0]
+    ['a--t', 'aagt']
+    >>> results[1] == nw_align('gattaca', 'gcatgcu')
+    True
+
+    """
     opts = opts or {}
     scorer = NWScorer(**opts)
-    scores, arrows = initialize_matrix(sequence1, sequence2, scorer)
-    path = list(trace_path(arrows))
-    alignment = build_alignment(sequence1, sequence2, path)
-    # score = compute_alignment_score(scores, path)
-    return alignment
+    batch = len(pairs)
+    encoded1 = [_seq_to_int(seq1) for (seq1, _) in pairs]
+    encoded2 = [_seq_to_int(seq2) for (_, seq2) in pairs]
+    lengths1 = np.array([e.shape[0] for e in encoded1], dtype=np.int64)
+    lengths2 = np.array([e.shape[0] for e in encoded2], dtype=np.int64)
+    max_n = int(lengths1.max()) if batch else 0
+    max_m = int(lengths2.max()) if batch else 0
+    seqs1 = np.zeros((batch, max_n), dtype=np.uint8)
+    seqs2 = np.zeros((batch, max_m), dtype=np.uint8)
+    for b in range(batch):
+        seqs1[b, :lengths1[b]] = encoded1[b]
+        seqs2[b, :lengths2[b]] = encoded2[b]
+    scores = np.zeros((batch, max_n + 1, max_m + 1), dtype=np.int32)
+    arrows = np.zeros((batch, max_n + 1, max_m + 1), dtype=np.int8)
+    if _NUMBA_AVAILABLE:
+        # Top edges are filled inside the kernel.
+        scores[:, 0, 0] = 0
+        _fill_nw_batch(
+            seqs1, lengths1, seqs2, lengths2,
+            scorer.match, scorer.mismatch, scorer.gap_extend,
+            scores, arrows)
+    else:
+        for b in range(batch):
+            n = int(lengths1[b])
+            m = int(lengths2[b])
+            scorer.fill_top_edges(scores[b, :n+1, :m+1], arrows[b, :n+1, :m+1])
+        _fill_nw_batch_vec(
+            seqs1, seqs2, scorer.match, scorer.mismatch, scorer.gap_extend,
+            scores, arrows)
+    alignments = []
+    for b, (seq1, seq2) in enumerate(pairs):
+        pair_arrows = arrows[b, :lengths1[b]+1, :lengths2[b]+1]
+        alignments.append(_traceback_alignment(seq1, seq2, pair_arrows))
+    return alignments
+
+
+def wsb_align_batch(
+        pairs: Sequence[tuple[str, str]], opts: Optional[ScoringOptions] = None,
+    ) -> list[list[str]]:
+    """Align many sequence pairs using Waterman-Smith-Beyer.
 
+    The WSB counterpart of nw_align_batch: one padded batch of
+    matrices and a single parallel kernel invocation when numba is
+    available, falling back to per-pair alignment otherwise.
 
-def wsb_align(seq1: str, seq2: str, opts: Optional[ScoringOptions] = None) -> list[str]:
+    >>> results = wsb_align_batch([('at', 'aagt'), ('ag', 'tagt')])
+    >>> results[0]
+    ['a--t', 'aagt']
+    >>> results[1] == wsb_align('ag', 'tagt')
+    True
+
+    """
+    scorer = WSBScorer(opts)
+    if not _NUMBA_AVAILABLE:
+        return [wsb_align(seq1, seq2, opts) for (seq1, seq2) in pairs]
+    batch = len(pairs)
+    encoded1 = [_seq_to_int(seq1) for (seq1, _) in pairs]
+    encoded2 = [_seq_to_int(seq2) for (_, seq2) in pairs]
+    lengths1 = np.array([e.shape[0] for e in encoded1], dtype=np.int64)
+    lengths2 = np.array([e.shape[0] for e in encoded2], dtype=np.int64)
+    max_n = int(lengths1.max()) if batch else 0
+    max_m = int(lengths2.max()) if batch else 0
+    seqs1 = np.zeros((batch, max_n), dtype=np.uint8)
+    seqs2 = np.zeros((batch, max_m), dtype=np.uint8)
+    for b in range(batch):
+        seqs1[b, :lengths1[b]] = encoded1[b]
+        seqs2[b, :lengths2[b]] = encoded2[b]
+    scores = np.zeros((batch, max_n + 1, max_m + 1), dtype=np.int32)
+    arrows = np.zeros((batch, max_n + 1, max_m + 1), dtype=np.int8)
+    _fill_wsb_batch(
+        seqs1, lengths1, seqs2, lengths2,
+        scorer.match, scorer.mismatch, scorer.gap_start, scorer.gap_extend,
+        scores, arrows)
+    alignments = []
+    for b, (seq1, seq2) in enumerate(pairs):
+        pair_arrows = arrows[b, :lengths1[b]+1, :lengths2[b]+1]
+        alignments.append(_traceback_alignment(seq1, seq2, pair_arrows))
+    return alignments
+
+
+def wsb_align(
+        seq1: str, seq2: str, opts: Optional[ScoringOptions] = None,
+        verbose: bool = False,
+    ) -> list[str]:
     """Align two sequences using Smith-Waterman-Beyer."""
     scorer = WSBScorer(opts)
     scores, arrows = initialize_matrix(seq1, seq2, scorer)
-    path = list(trace_path(arrows))
-    alignment = build_alignment(seq1, seq2, path)
-    # score = compute_alignment_score(scores, path)
-    return alignment
+    if verbose:
+        print_matrix(scores)
+        print_arrow_matrix(arrows)
+    return _traceback_alignment(seq1, seq2, arrows)
 
 
 def initialize_matrix(
         sequence1: str, sequence2: str, scorer: Scorer,
+        band: Optional[int] = None,
     ) -> tuple[ScoreMatrix, ArrowMatrix]:
     """Return the initialized matrix."""
     n = len(sequence1)
     m = len(sequence2)
     width = m + 1
-    scores, arrows = scorer.get_top_edges(width)
-    for i in range(n):
-        scorer.fill_next_row(scores, arrows, i + 1, width, sequence1, sequence2)
+    # Preallocate both matrices as contiguous arrays. Scores are 4
+    # bytes per cell and arrows 1 byte, rather than a pointer to a
+    # boxed int each, which keeps far more of the matrix in cache.
+    if band is None:
+        # Use the narrowest dtype the score bound allows. Halving the
+        # element size halves the memory traffic of the fill.
+        bound = scorer.score_bound(n, m)
+        if bound < 120:
+            dtype: type = np.int8
+        elif bound < 32000:
+            dtype = np.int16
+        else:
+            dtype = np.int32
+        # Every cell is written by the edge and body fills, so skip
+        # the zeroing memset over the whole matrix.
+        scores: ScoreMatrix = np.empty((n + 1, width), dtype=dtype)
+        arrows = np.empty((n + 1, width), dtype=np.int8)
+        scorer.fill_top_edges(scores, arrows)
+        scorer.fill_body(scores, arrows, sequence1, sequence2)
+    else:
+        scores = np.full((n + 1, width), NEG_SENTINEL, dtype=np.int32)
+        arrows = np.zeros((n + 1, width), dtype=np.int8)
+        scorer.fill_banded(scores, arrows, sequence1, sequence2, band)
     return (scores, arrows)
 
 
-def is_match(i: int, j: int, seq1: str, seq2: str) -> bool:
+def is_match(i: int, j: int, seq1: SeqData, seq2: SeqData) -> bool:
     """True if the sequences match at positions i, j; False otherwise.
 
     """
@@ -314,20 +1173,52 @@ def trace_path(arrows: ArrowMatrix) -> Iterable[tuple[int, int, int]]:
     [(2, 4, 1), (1, 3, 3), (1, 2, 3), (1, 1, 1), (0, 0, 0)]
 
     """
-    i = len(arrows) - 1
-    j = len(arrows[0]) - 1
-    arrow = arrows[i][j]
+    i = arrows.shape[0] - 1
+    j = arrows.shape[1] - 1
+    arrow = int(arrows[i, j])
     yield (i, j, arrow)
+    while arrow != S_ARROW:
+        step = ARROW_STEPS[arrow]
+        i -= step[0]
+        j -= step[1]
+        arrow = int(arrows[i, j])
+        yield (i, j, arrow)
+
+
+def _traceback_alignment(
+        sequence1: str, sequence2: str, arrows: ArrowMatrix,
+    ) -> list[str]:
+    """Build an alignment by walking the arrow matrix directly.
+
+    Fuses trace_path and build_alignment without materializing the
+    path as a list of tuples, which saves an allocation per traceback
+    step. The separate functions remain for callers that want the
+    path itself.
+
+    """
+    i = arrows.shape[0] - 1
+    j = arrows.shape[1] - 1
+    aligned1: list[str] = []
+    aligned2: list[str] = []
+    arrow = int(arrows[i, j])
     while arrow != S_ARROW:
         if arrow == D_ARROW:
+            aligned1.append(sequence1[i-1])
+            aligned2.append(sequence2[j-1])
             i -= 1
             j -= 1
         elif arrow == T_ARROW:
+            aligned1.append(sequence1[i-1])
+            aligned2.append('-')
             i -= 1
-        elif arrow == L_ARROW:
+        else:
+            aligned1.append('-')
+            aligned2.append(sequence2[j-1])
             j -= 1
-        arrow = arrows[i][j]
-        yield (i, j, arrow)
+        arrow = int(arrows[i, j])
+    aligned1.reverse()
+    aligned2.reverse()
+    return [''.join(aligned1), ''.join(aligned2)]
 
 
 def build_alignment(sequence1: str, sequence2: str, path: Sequence[tuple[int, int, int]]) -> list[str]:
@@ -342,40 +1233,140 @@ def build_alignment(sequence1: str, sequence2: str, path: Sequence[tuple[int, in
     aagt
 
     """
-    aligned1 = ''
-    aligned2 = ''
-    for (i, j, arrow) in islice(reversed(path), 1, None):
+    # Collect characters and join once at the end. Building the
+    # strings with repeated concatenation would copy every
+    # intermediate string, making the traceback quadratic.
+    aligned1 = []
+    aligned2 = []
+    for k in range(len(path) - 2, -1, -1):
+        i, j, arrow = path[k]
         i -= 1
         j -= 1
-        # print(i, j, arrow)
         if arrow == D_ARROW:
-            aligned1 = aligned1 + sequence1[i]
-            aligned2 = aligned2 + sequence2[j]
+            aligned1.append(sequence1[i])
+            aligned2.append(sequence2[j])
         elif arrow == T_ARROW:
-            aligned1 = aligned1 + sequence1[i]
-            aligned2 = aligned2 + '-'
+            aligned1.append(sequence1[i])
+            aligned2.append('-')
         elif arrow == L_ARROW:
-            aligned1 = aligned1 + '-'
-            aligned2 = aligned2 + sequence2[j]
-    return [aligned1, aligned2]
+            aligned1.append('-')
+            aligned2.append(sequence2[j])
+    return [''.join(aligned1), ''.join(aligned2)]
+
+
+# 2-bit nucleotide codes, 32 bases per 64-bit word. Upper and lower
+# case map to the same code, and U shares the T code.
+BASE_CODES = np.zeros(256, dtype=np.uint8)
+for _index, _base in enumerate('ACGT'):
+    BASE_CODES[ord(_base)] = _index
+    BASE_CODES[ord(_base.lower())] = _index
+BASE_CODES[ord('U')] = BASE_CODES[ord('T')]
+BASE_CODES[ord('u')] = BASE_CODES[ord('T')]
+
+_BASE_MASK = np.uint64(0x5555555555555555)
+
+
+def pack_bases(sequence: str) -> tuple[npt.NDArray[np.uint64], int]:
+    """Pack a nucleotide sequence into 2-bit codes, 32 per word.
+
+    Returns the packed words and the number of bases. Only meaningful
+    for sequences over the A/C/G/T/U alphabet.
+
+    >>> words, count = pack_bases('acgt')
+    >>> count
+    4
+    >>> hex(int(words[0]))
+    '0xe4'
+
+    """
+    codes = BASE_CODES[_seq_to_int(sequence)].astype(np.uint64)
+    count = codes.shape[0]
+    n_words = -(-count // 32)
+    padded = np.zeros(n_words * 32, dtype=np.uint64)
+    padded[:count] = codes
+    shifts = np.arange(32, dtype=np.uint64) * np.uint64(2)
+    words: npt.NDArray[np.uint64] = np.bitwise_or.reduce(
+        padded.reshape(-1, 32) << shifts, axis=1)
+    return (words, count)
+
+
+def mismatch_mask(
+        words1: npt.NDArray[np.uint64], words2: npt.NDArray[np.uint64],
+    ) -> npt.NDArray[np.uint64]:
+    """Mark differing bases of two packed sequences, one bit per base.
+
+    XOR makes each 2-bit field zero iff the bases are equal; folding
+    the high bit onto the low bit leaves one mismatch bit per base,
+    so one word-sized operation compares 32 bases at a time.
+
+    """
+    xor = words1 ^ words2
+    result: npt.NDArray[np.uint64] = (xor | (xor >> np.uint64(1))) & _BASE_MASK
+    return result
+
+
+def count_mismatches(sequence1: str, sequence2: str) -> int:
+    """Count differing positions of two equal-length DNA sequences.
+
+    >>> count_mismatches('acgt', 'aggt')
+    1
+    >>> count_mismatches('acgtacgtacgtacgtacgtacgtacgtacgtacgt', 'a' * 36)
+    27
+
+    """
+    words1, _ = pack_bases(sequence1)
+    words2, _ = pack_bases(sequence2)
+    return int(np.bitwise_count(mismatch_mask(words1, words2)).sum())
+
+
+def pack_arrows(arrows: ArrowMatrix) -> npt.NDArray[np.uint8]:
+    """Pack an arrow matrix into two bits per arrow.
+
+    Arrow values fit in two bits, so four arrows pack into each byte.
+    This shrinks a stored arrow matrix fourfold, which matters when
+    keeping matrices around for many or very long alignments.
+
+    >>> _, arrows = initialize_matrix('at', 'aagt', NWScorer(1, -1, -1))
+    >>> packed = pack_arrows(arrows)
+    >>> packed.shape
+    (3, 2)
+    >>> (unpack_arrows(packed, 5) == arrows).all()
+    np.True_
+
+    """
+    height, width = arrows.shape
+    padded_width = -(-width // 4) * 4
+    padded = np.zeros((height, padded_width), dtype=np.uint8)
+    padded[:, :width] = arrows
+    groups = padded.reshape(height, padded_width // 4, 4)
+    shifts = np.arange(0, 8, 2, dtype=np.uint8)
+    result: npt.NDArray[np.uint8] = np.bitwise_or.reduce(
+        groups << shifts, axis=2).astype(np.uint8)
+    return result
+
+
+def unpack_arrows(packed: npt.NDArray[np.uint8], width: int) -> ArrowMatrix:
+    """Unpack a packed arrow matrix back to one arrow per cell."""
+    shifts = np.arange(0, 8, 2, dtype=np.uint8)
+    expanded = (packed[:, :, None] >> shifts) & 3
+    result: ArrowMatrix = expanded.reshape(
+        packed.shape[0], -1)[:, :width].astype(np.int8)
+    return result
 
 
 def print_matrix(matrix: Matrix) -> None:
     """Print a matrix."""
     for row in matrix:
-        print(row)
+        print([int(value) for value in row])
 
 
 def print_alignment(alignment: list[str]) -> None:
     """Print an alignment."""
     aligned1, aligned2 = alignment
     max_line_length = 72
-    bars = ''
-    for (c1, c2) in zip(aligned1, aligned2):
-        if c1 == c2:
-            bars += '|'
-        else:
-            bars += ' '
+    bars = ''.join(
+        '|' if c1 == c2 else ' '
+        for (c1, c2) in zip(aligned1, aligned2))
     while aligned1:
         print(aligned1[:max_line_length])
         print(bars[:max_line_length].rstrip())
@@ -390,5 +1381,5 @@ def print_alignment(alignment: list[str]) -> None:
 def print_arrow_matrix(matrix: ArrowMatrix) -> None:
     """Pretty print an arrow matrix."""
     for row in matrix:
-        arrow_line = ' '.join(ARROW_CHAR_MAP[e] for e in row)
+        arrow_line = ' '.join(ARROW_CHAR_MAP[int(e)] for e in row)
         print('[' + arrow_line + ']')
@@ -0,0 +1,603 @@
+"""Phylogenetic tree construction.
+
+This module provides distance calculations and clustering methods for
+building phylogenetic trees from sequence data. Distances between
+sequence pairs use the Jukes-Cantor model via the jc_distance()
+function. Trees are built from a distance matrix with the wpgma(),
+upgma() and neighbor_joining() functions.
+
+"""
+import functools
+import hashlib
+import math
+import os
+import string
+from collections.abc import Sequence
+
+from coolseq.align.pairwise import count_mismatches, wsb_align_batch
+
+import numpy as np
+import numpy.typing as npt
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _NUMBA_AVAILABLE = False
+
+try:
+    from scipy.cluster.hierarchy import linkage as _scipy_linkage
+    from scipy.spatial.distance import squareform as _squareform
+    _SCIPY_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _SCIPY_AVAILABLE = False
+
+
+# Type definitions
+DistanceMatrix = npt.NDArray[np.float64]
+# A cluster is either a leaf name or a (left, right, height) tuple.
+Cluster = str | tuple['Cluster', 'Cluster', float]
+
+
+def jc_calc(p_distance: float) -> float:
+    """Return the Jukes-Cantor distance for a proportional distance.
+
+    The model saturates at p = 3/4, the expected mismatch proportion
+    of unrelated sequences; at or beyond that the corrected distance
+    is infinite rather than a math domain error.
+
+    >>> round(jc_calc(1 / 7), 4)
+    0.1585
+    >>> jc_calc(0.75)
+    inf
+
+    """
+    if p_distance >= 0.75:
+        return math.inf
+    return -0.75 * math.log(1 - (4 / 3) * p_distance)
+
+
+def jc_calc_vec(
+        p_distances: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+    """Return Jukes-Cantor distances for an array of p-distances.
+
+    Vectorized twin of jc_calc: one log1p call over the whole array,
+    with zero proportions mapping to exactly 0.0 and saturated ones
+    (p >= 3/4) to inf, matching the scalar path.
+
+    >>> jc_calc_vec(np.array([0.0, 1 / 7])).round(4)
+    array([0.    , 0.1585])
+    >>> jc_calc_vec(np.array([0.75, 1.0]))
+    array([inf, inf])
+
+    """
+    p_distances = np.asarray(p_distances, dtype=np.float64)
+    result = np.zeros_like(p_distances)
+    result[p_distances >= 0.75] = np.inf
+    mask = (p_distances > 0) & (p_distances < 0.75)
+    result[mask] = -0.75 * np.log1p(-(4 / 3) * p_distances[mask])
+    return result
+
+
+def jc_distance(seq1: str, seq2: str) -> float:
+    """Return the Jukes-Cantor distance between two sequences.
+
+    The mismatch count is computed by comparing the sequences as
+    uint8 arrays, which NumPy vectorizes, rather than walking the
+    strings character by character. Any length difference between the
+    sequences counts as mismatches.
+
+    >>> round(jc_distance('gattaca', 'gettaca'), 4)
+    0.1585
+
+    """
+    encoded1 = np.frombuffer(str(seq1).encode('ascii'), dtype=np.uint8)
+    encoded2 = np.frombuffer(str(seq2).encode('ascii'), dtype=np.uint8)
+    overlap = min(encoded1.shape[0], encoded2.shape[0])
+    length = max(encoded1.shape[0], encoded2.shape[0])
+    diffs = int(np.count_nonzero(encoded1[:overlap] != encoded2[:overlap]))
+    diffs += length - overlap
+    return jc_calc(diffs / length)
+
+
+def jc_distance_packed(seq1: str, seq2: str) -> float:
+    """Return the Jukes-Cantor distance of two packed A/C/G/T sequences.
+
+    Both sequences are 2-bit packed so the mismatch count runs as
+    XOR plus popcount over uint64 words, 32 bases per word, a quarter
+    of the memory traffic of byte-wise comparison. Only valid for
+    equal-length sequences over the A/C/G/T/U alphabet; jc_distance
+    remains the general entry point (gap characters from aligned
+    sequences would be miscounted here).
+
+    >>> round(jc_distance_packed('gattaca', 'gcttaca'), 4)
+    0.1585
+
+    """
+    diffs = count_mismatches(seq1, seq2)
+    if diffs == 0:
+        return 0.0
+    return jc_calc(diffs / len(seq1))
+
+
+def jc_distance_matrix(sequences: Sequence[str]) -> DistanceMatrix:
+    """Return the Jukes-Cantor distances between all sequence pairs.
+
+    When the sequences share one length, they are stacked into a
+    single (N, L) uint8 array and every pairwise mismatch count comes
+    from one broadcast comparison in C, rather than N*(N-1)/2 calls
+    that each re-encode their arguments. Mixed lengths fall back to
+    per-pair jc_distance calls.
+
+    >>> matrix = jc_distance_matrix(['gattaca', 'gettaca', 'gattaca'])
+    >>> matrix.shape
+    (3, 3)
+    >>> float(matrix[0, 2])
+    0.0
+    >>> round(float(matrix[0, 1]), 4)
+    0.1585
+
+    """
+    encoded = [
+        np.frombuffer(str(seq).encode('ascii'), dtype=np.uint8)
+        for seq in sequences
+    ]
+    if len({e.shape[0] for e in encoded}) > 1:
+        size = len(encoded)
+        result = np.zeros((size, size))
+        for i in range(size):
+            for j in range(i + 1, size):
+                distance = jc_distance(sequences[i], sequences[j])
+                result[i, j] = result[j, i] = distance
+        return result
+    stacked = np.stack(encoded)
+    length = stacked.shape[1]
+    size = stacked.shape[0]
+    result = np.zeros((size, size))
+    # One row against all later rows per step: still a C-level byte
+    # compare, but peak temporary memory stays O(N*L) instead of the
+    # O(N^2*L) of a full three-way broadcast.
+    for i in range(size - 1):
+        diffs = (stacked[i] != stacked[i+1:]).sum(axis=1)
+        result[i, i+1:] = jc_calc_vec(diffs / length)
+    return result + result.T
+
+
+def _find_closest_scan(
+        matrix: DistanceMatrix, size: int,
+    ) -> tuple[int, int]:
+    """Scalar triangle scan behind find_closest.
+
+    Compiled with numba when available, which beats the argmin
+    formulation by skipping the index-array and triangle-copy
+    allocations every step.
+
+    """
+    best_i = 0
+    best_j = 1
+    best = matrix[0, 1]
+    for i in range(size):
+        for j in range(i + 1, size):
+            if matrix[i, j] < best:
+                best = matrix[i, j]
+                best_i = i
+                best_j = j
+    return best_i, best_j
+
+
+if _NUMBA_AVAILABLE:
+    _find_closest_scan = njit(cache=True)(_find_closest_scan)
+
+
+def find_closest(matrix: DistanceMatrix, size: int) -> tuple[int, int]:
+    """Return the indices of the closest pair of clusters.
+
+    Ties resolve to the first pair in row-major order either way.
+
+    """
+    if _NUMBA_AVAILABLE:
+        i, j = _find_closest_scan(
+            np.ascontiguousarray(matrix[:size, :size]), size)
+        return int(i), int(j)
+    rows, cols = np.triu_indices(size, k=1)
+    index = int(matrix[rows, cols].argmin())
+    return int(rows[index]), int(cols[index])
+
+
+def merge_rows(
+        matrix: DistanceMatrix, size: int, k: int, l: int,
+        new_row: npt.NDArray[np.float64],
+    ) -> int:
+    """Merge clusters k and l of the working matrix in place.
+
+    The merged cluster's distances overwrite row and column k, and
+    the last active row and column are swapped into l's slot, so a
+    merge costs two row copies instead of rebuilding the matrix.
+    Returns the new active size.
+
+    """
+    matrix[k, :size] = new_row
+    matrix[:size, k] = new_row
+    matrix[k, k] = 0.0
+    last = size - 1
+    if l != last:
+        matrix[l, :size] = matrix[last, :size]
+        matrix[:size, l] = matrix[:size, last]
+    return last
+
+
+def wpgma(matrix: DistanceMatrix, names: Sequence[str]) -> Cluster:
+    """Build a tree from a distance matrix by WPGMA clustering.
+
+    The working matrix shrinks in place via merge_rows rather than
+    being rebuilt each step, so each of the N-1 merges costs O(N)
+    row arithmetic.
+
+    >>> matrix = np.array([
+    ...     [0, 16, 16, 10],
+    ...     [16, 0, 8, 8],
+    ...     [16, 8, 0, 4],
+    ...     [10, 8, 4, 0],
+    ... ])
+    >>> wpgma(matrix, 'abcd')
+    ('a', ('b', ('c', 'd', 2.0), 4.0), 7.25)
+
+    """
+    working = np.array(matrix, dtype=np.float64)
+    clusters: list[Cluster] = list(names)
+    size = len(clusters)
+    while size > 1:
+        k, l = find_closest(working, size)
+        height = float(working[k, l]) / 2
+        new_row = 0.5 * (working[k, :size] + working[l, :size])
+        clusters[k] = (clusters[k], clusters[l], height)
+        size = merge_rows(working, size, k, l, new_row)
+        clusters[l] = clusters[size]
+        del clusters[size]
+    return clusters[0]
+
+
+def upgma(matrix: DistanceMatrix, names: Sequence[str]) -> Cluster:
+    """Build a tree from a distance matrix by UPGMA clustering.
+
+    Like wpgma, but the merged row is the mean weighted by cluster
+    leaf counts.
+
+    >>> matrix = np.array([
+    ...     [0, 16, 16, 10],
+    ...     [16, 0, 8, 8],
+    ...     [16, 8, 0, 4],
+    ...     [10, 8, 4, 0],
+    ... ])
+    >>> upgma(matrix, 'abcd')
+    ('a', ('b', ('c', 'd', 2.0), 4.0), 7.0)
+
+    """
+    working = np.array(matrix, dtype=np.float64)
+    clusters: list[Cluster] = list(names)
+    counts = [1] * len(clusters)
+    size = len(clusters)
+    while size > 1:
+        k, l = find_closest(working, size)
+        height = float(working[k, l]) / 2
+        weight_k = counts[k]
+        weight_l = counts[l]
+        new_row = (
+            weight_k * working[k, :size] + weight_l * working[l, :size]
+        ) / (weight_k + weight_l)
+        clusters[k] = (clusters[k], clusters[l], height)
+        counts[k] = weight_k + weight_l
+        size = merge_rows(working, size, k, l, new_row)
+        clusters[l] = clusters[size]
+        counts[l] = counts[size]
+        del clusters[size]
+        del counts[size]
+    return clusters[0]
+
+
+def nj_divergence_vector(
+        matrix: DistanceMatrix, size: int,
+    ) -> npt.NDArray[np.float64]:
+    """Return each cluster's total distance to all other clusters."""
+    divergence: npt.NDArray[np.float64] = matrix[:size, :size].sum(axis=1)
+    return divergence
+
+
+def nj_divergence_matrix(matrix: DistanceMatrix, size: int) -> DistanceMatrix:
+    """Return the rate-corrected matrix that picks the next NJ join.
+
+    The whole matrix is one broadcast expression with the diagonal
+    zeroed afterwards, rather than a nested per-cell loop.
+
+    """
+    divergence = nj_divergence_vector(matrix, size)
+    result = (
+        (size - 2) * matrix[:size, :size]
+        - divergence[:, np.newaxis] - divergence[np.newaxis, :]
+    )
+    np.fill_diagonal(result, 0.0)
+    return result
+
+
+def nj_find_smallest(matrix: DistanceMatrix, size: int) -> tuple[int, int]:
+    """Return the indices of the smallest rate-corrected distance."""
+    return find_closest(matrix, size)
+
+
+def _nj_find_smallest_fused(
+        matrix: DistanceMatrix, divergence: npt.NDArray[np.float64],
+        size: int,
+    ) -> tuple[int, int]:
+    """Argmin of the NJ criterion without materializing it.
+
+    Computes (size-2)*d - r_i - r_j on the fly while scanning the
+    upper triangle, fusing nj_divergence_matrix and the search into
+    one pass over the distances. Compiled with numba when available.
+
+    """
+    best_i = 0
+    best_j = 1
+    best = (size - 2) * matrix[0, 1] - divergence[0] - divergence[1]
+    for i in range(size):
+        div_i = divergence[i]
+        for j in range(i + 1, size):
+            corrected = (size - 2) * matrix[i, j] - div_i - divergence[j]
+            if corrected < best:
+                best = corrected
+                best_i = i
+                best_j = j
+    return best_i, best_j
+
+
+if _NUMBA_AVAILABLE:
+    _nj_find_smallest_fused = njit(cache=True)(_nj_find_smallest_fused)
+
+
+def neighbor_joining(matrix: DistanceMatrix, names: Sequence[str]) -> Cluster:
+    """Build a tree from a distance matrix by neighbor joining.
+
+    Joins the pair minimizing the rate-corrected distance each step,
+    mutating the working matrix in place like wpgma. Since NJ trees
+    are unrooted, the recorded height of a join is the midpoint of
+    the joined pair's distance.
+
+    >>> matrix = np.array([
+    ...     [0, 5, 9, 9, 8],
+    ...     [5, 0, 10, 10, 9],
+    ...     [9, 10, 0, 8, 7],
+    ...     [9, 10, 8, 0, 3],
+    ...     [8, 9, 7, 3, 0],
+    ... ], dtype=np.float64)
+    >>> neighbor_joining(matrix, 'abcde')
+    (((('a', 'b', 2.5), 'c', 3.5), 'e', 1.5), 'd', 1.0)
+
+    """
+    working = np.array(matrix, dtype=np.float64)
+    clusters: list[Cluster] = list(names)
+    size = len(clusters)
+    # The divergence vector is maintained incrementally: a merge only
+    # changes two rows, so each step adjusts r in O(N) instead of
+    # resumming the whole matrix, keeping NJ at O(N^3) overall.
+    divergence = nj_divergence_vector(working, size)
+    while size > 2:
+        if _NUMBA_AVAILABLE:
+            # Fused criterion-and-search kernel: one pass over the
+            # distances, no corrected matrix materialized.
+            k, l = _nj_find_smallest_fused(
+                np.ascontiguousarray(working[:size, :size]),
+                divergence, size)
+        else:
+            corrected = (
+                (size - 2) * working[:size, :size]
+                - divergence[:, np.newaxis] - divergence[np.newaxis, :]
+            )
+            k, l = nj_find_smallest(corrected, size)
+        kl_dist = float(working[k, l])
+        new_row = 0.5 * (working[k, :size] + working[l, :size] - kl_dist)
+        divergence = (
+            divergence - working[k, :size] - working[l, :size] + new_row
+        )
+        divergence[k] = new_row.sum() - new_row[k] - new_row[l]
+        clusters[k] = (clusters[k], clusters[l], kl_dist / 2)
+        size = merge_rows(working, size, k, l, new_row)
+        divergence[l] = divergence[size]
+        divergence = divergence[:size]
+        clusters[l] = clusters[size]
+        del clusters[size]
+    if size == 2:
+        return (clusters[0], clusters[1], float(working[0, 1]) / 2)
+    return clusters[0]
+
+
+def wpgma_fast(matrix: DistanceMatrix) -> npt.NDArray[np.float64]:
+    """Return WPGMA linkage rows via SciPy's C implementation.
+
+    Skips the tuple tree entirely: the matrix is condensed with
+    squareform and handed to scipy.cluster.hierarchy.linkage with
+    method='weighted', which clusters in C. Equivalent to
+    make_links(wpgma(matrix, names), names) up to the ordering of
+    tied merges, and the right entry point when the only consumer is
+    a dendrogram plot.
+
+    """
+    if not _SCIPY_AVAILABLE:
+        raise RuntimeError('scipy is not installed')
+    return _scipy_linkage(_squareform(matrix), method='weighted')
+
+
+def upgma_fast(matrix: DistanceMatrix) -> npt.NDArray[np.float64]:
+    """Return UPGMA linkage rows via SciPy's C implementation.
+
+    The UPGMA twin of wpgma_fast, using method='average'.
+
+    """
+    if not _SCIPY_AVAILABLE:
+        raise RuntimeError('scipy is not installed')
+    return _scipy_linkage(_squareform(matrix), method='average')
+
+
+def make_links(tree: Cluster, names: Sequence[str]) -> npt.NDArray[np.float64]:
+    """Return the SciPy linkage rows for a clustering tree.
+
+    Leaves are numbered by their position in names and internal
+    nodes from len(names) upward in the order their rows are
+    emitted. The tree is walked with an explicit post-order stack
+    rather than recursion, so deep trees cannot hit the interpreter
+    recursion limit, and each row lands directly in a preallocated
+    array. Row heights are full merge distances, twice the tree's
+    midpoint heights, which is what scipy.cluster.hierarchy expects.
+
+    >>> tree = ('a', ('b', ('c', 'd', 2.0), 4.0), 7.25)
+    >>> make_links(tree, 'abcd')
+    array([[ 2. ,  3. ,  4. ,  2. ],
+           [ 1. ,  4. ,  8. ,  3. ],
+           [ 0. ,  5. , 14.5,  4. ]])
+
+    """
+    index = {name: i for i, name in enumerate(names)}
+    links = np.empty((len(index) - 1, 4))
+    stack: list[tuple[Cluster, bool]] = [(tree, False)]
+    emitted: list[tuple[int, int]] = []
+    row = 0
+    while stack:
+        node, visited = stack.pop()
+        if not isinstance(node, tuple):
+            emitted.append((index[node], 1))
+        elif not visited:
+            stack.append((node, True))
+            stack.append((node[1], False))
+            stack.append((node[0], False))
+        else:
+            right_id, right_count = emitted.pop()
+            left_id, left_count = emitted.pop()
+            count = left_count + right_count
+            links[row] = (left_id, right_id, 2 * node[2], count)
+            emitted.append((len(index) + row, count))
+            row += 1
+    return links
+
+
+def generate_distance_matrix(
+        sequences: Sequence[str],
+    ) -> DistanceMatrix:
+    """Return the Jukes-Cantor distance matrix for a set of sequences.
+
+    Each pair is globally aligned first so the distances account for
+    indels; the Jukes-Cantor correction is then applied to the
+    aligned pair. All upper-triangle pairs go through one
+    wsb_align_batch call, which spreads the alignment work across
+    cores, and the result is mirrored.
+
+    >>> matrix = generate_distance_matrix(['gattaca', 'gattata'])
+    >>> matrix.shape
+    (2, 2)
+    >>> round(float(matrix[0, 1]), 4)
+    0.1585
+
+    """
+    size = len(sequences)
+    result = np.zeros((size, size))
+    # Identical pairs are distance zero, and a repeated pair of
+    # sequences only needs aligning once; the key is order-normalized
+    # since the distance is symmetric.
+    todo: dict[tuple[str, str], list[tuple[int, int]]] = {}
+    for i in range(size):
+        for j in range(i + 1, size):
+            seq1, seq2 = str(sequences[i]), str(sequences[j])
+            if seq1 == seq2:
+                continue
+            key = (seq1, seq2) if seq1 <= seq2 else (seq2, seq1)
+            todo.setdefault(key, []).append((i, j))
+    alignments = wsb_align_batch(list(todo))
+    for cells, (aligned1, aligned2) in zip(todo.values(), alignments):
+        distance = jc_distance(aligned1, aligned2)
+        for (i, j) in cells:
+            result[i, j] = distance
+    return result + result.T
+
+
+def generate_names(count: int) -> list[str]:
+    """Return count spreadsheet-style names: A-Z, then AA, AB, ...
+
+    >>> generate_names(3)
+    ['A', 'B', 'C']
+    >>> generate_names(28)[25:]
+    ['Z', 'AA', 'AB']
+
+    """
+    letters = string.ascii_uppercase
+    names = []
+    for i in range(count):
+        name = ''
+        n = i
+        while n >= 0:
+            name = letters[n % 26] + name
+            n = n // 26 - 1
+        names.append(name)
+    return names
+
+
+def get_example1() -> tuple[DistanceMatrix, list[str]]:
+    """Return a small ultrametric example matrix and its names."""
+    matrix = np.array([
+        [0, 16, 16, 10],
+        [16, 0, 8, 8],
+        [16, 8, 0, 4],
+        [10, 8, 4, 0],
+    ], dtype=np.float64)
+    return matrix, generate_names(4)
+
+
+def get_example2() -> tuple[DistanceMatrix, list[str]]:
+    """Return an additive example matrix suited to neighbor joining."""
+    matrix = np.array([
+        [0, 5, 9, 9, 8],
+        [5, 0, 10, 10, 9],
+        [9, 10, 0, 8, 7],
+        [9, 10, 8, 0, 3],
+        [8, 9, 7, 3, 0],
+    ], dtype=np.float64)
+    return matrix, generate_names(5)
+
+
+def get_example3() -> tuple[DistanceMatrix, list[str]]:
+    """Return a six-taxon ultrametric example matrix and its names."""
+    matrix = np.array([
+        [0, 2, 4, 6, 6, 8],
+        [2, 0, 4, 6, 6, 8],
+        [4, 4, 0, 6, 6, 8],
+        [6, 6, 6, 0, 4, 8],
+        [6, 6, 6, 4, 0, 8],
+        [8, 8, 8, 8, 8, 0],
+    ], dtype=np.float64)
+    return matrix, generate_names(6)
+
+
+@functools.lru_cache(maxsize=None)
+def get_example4() -> tuple[DistanceMatrix, list[str]]:
+    """Return the distance matrix for the bundled rRNA samples.
+
+    The samples are aligned pairwise, which dwarfs the cost of the
+    hardcoded examples, so the result is memoized for the process
+    and cached on disk under ~/.cache/coolseq, keyed by the sample
+    content. Delete the cache file to force a recompute.
+
+    """
+    # Biopython is only needed here, so the import stays local to
+    # keep module import time down.
+    from Bio import SeqIO
+    from importlib.resources import files
+    path = files('coolseq').joinpath('align/samples.fasta')
+    records = list(SeqIO.parse(str(path), 'fasta'))  # type: ignore[no-untyped-call]
+    sequences = [str(record.seq) for record in records]
+    names = [record.id for record in records]
+    digest = hashlib.sha256('\0'.join(sequences).encode('ascii')).hexdigest()
+    cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'coolseq')
+    cache_path = os.path.join(cache_dir, f'{digest}.npy')
+    if os.path.exists(cache_path):
+        return np.load(cache_path), names
+    matrix = generate_distance_matrix(sequences)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(cache_path, matrix)
+    return matrix, names